@@ -8,10 +8,14 @@ import asyncio
 import sys
 import json
 import hashlib
+import re
+from collections import Counter
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
+import queue
 import sqlite3
+import threading
 
 # Add parent directory for imports
 sys.path.append(str(Path(__file__).parent.parent))
@@ -20,19 +24,80 @@ from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+# Optional fast JSON codec for metadata blobs
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj, default=str).decode()
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+# ASCII icon constants: keeps response text one byte per character
+# instead of 4-byte emoji codepoints.
+ICON_BRAIN = "[AI]"
+ICON_OK = "[OK]"
+ICON_WARN = "[WARN]"
+ICON_ERROR = "[ERROR]"
+ICON_TIP = "[TIP]"
+ICON_PARALLEL = "[P]"
+ICON_SEQUENTIAL = "[S]"
+
 # MCP Server
 app = Server("context-intelligence")
 
+def _context_id(source: str, content: str, focus_area: str) -> str:
+    """Derive a stable context id from its identifying fields."""
+    # NUL separators cannot appear in the fields, so joined keys are
+    # unambiguous; sha256 avoids md5 and hashes a single encoded buffer.
+    return hashlib.sha256(f"{source}\0{content}\0{focus_area}".encode()).hexdigest()
+
 class ContextDatabase:
     """Simple context storage using SQLite."""
 
+    _INSERT_CTX_SQL = '''
+        INSERT OR REPLACE INTO contexts
+        (id, source, content, focus_area, timestamp, metadata)
+        VALUES (?, ?, ?, ?, ?, ?)
+    '''
+
+    _SELECT_CTX_SQL = '''
+        SELECT source, content, timestamp, metadata
+        FROM contexts
+        WHERE focus_area = ?
+        ORDER BY timestamp DESC
+        LIMIT ?
+    '''
+
     def __init__(self, db_path: str = "/tmp/context_intelligence.db"):
         self.db_path = db_path
+        # One long-lived connection shared across calls; the lock serializes
+        # access since the MCP handlers may run on different threads.
+        # cached_statements keeps the prepared statements for the constant
+        # SQL above alive between calls.
+        self._conn = sqlite3.connect(db_path, check_same_thread=False,
+                                     cached_statements=128)
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA mmap_size=268435456")
+        self._conn.execute("PRAGMA cache_size=-65536")  # 64 MiB page cache
         self.init_db()
+        # Single writes go through a background thread that coalesces
+        # queued rows into one transaction, so store_context returns
+        # without waiting on the commit.
+        self._write_queue: "queue.SimpleQueue[tuple]" = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._writer_loop,
+                                        name="ctx-db-writer", daemon=True)
+        self._writer.start()
 
     def init_db(self):
         """Initialize the database schema."""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._conn
         cursor = conn.cursor()
 
         cursor.execute('''
@@ -68,51 +133,74 @@ class ContextDatabase:
             )
         ''')
 
+        # Covering indices for the hot read paths: focus-area lookups walk
+        # idx_ctx_focus_ts in output order instead of scanning and sorting.
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_ctx_focus_ts
+            ON contexts(focus_area, timestamp DESC)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_workflows_status_created
+            ON workflows(status, created_at)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_plans_created
+            ON execution_plans(created_at)
+        ''')
+
         conn.commit()
-        conn.close()
 
-    def store_context(self, source: str, content: str, focus_area: str, metadata: Dict = None):
-        """Store context information."""
-        context_id = hashlib.md5(f"{source}:{content}:{focus_area}".encode()).hexdigest()
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def _writer_loop(self):
+        """Drain queued context rows into batched transactions."""
+        while True:
+            rows = [self._write_queue.get()]
+            try:
+                while len(rows) < 256:
+                    rows.append(self._write_queue.get_nowait())
+            except queue.Empty:
+                pass
+            try:
+                with self._lock, self._conn:
+                    self._conn.executemany(self._INSERT_CTX_SQL, rows)
+            except sqlite3.Error as e:
+                # Drop the failed batch but keep the writer alive; a dead
+                # writer would silently lose every later store_context.
+                print(f"{ICON_ERROR} Context batch write failed "
+                      f"({len(rows)} rows dropped): {e}", file=sys.stderr)
 
-        cursor.execute('''
-            INSERT OR REPLACE INTO contexts
-            (id, source, content, focus_area, timestamp, metadata)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
+    def store_context(self, source: str, content: str, focus_area: str, metadata: Dict = None):
+        """Store context information; the write is committed asynchronously."""
+        context_id = _context_id(source, content, focus_area)
+        self._write_queue.put((
             context_id, source, content, focus_area,
             datetime.now().isoformat(),
-            json.dumps(metadata or {})
+            _json_dumps(metadata or {})
         ))
-
-        conn.commit()
-        conn.close()
         return context_id
 
+    def store_contexts_bulk(self, rows: List[tuple]):
+        """Store many contexts in a single transaction.
+
+        Each row is a full parameter tuple for ``_INSERT_CTX_SQL``:
+        (id, source, content, focus_area, timestamp, metadata_json).
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(self._INSERT_CTX_SQL, rows)
+        return len(rows)
+
     def get_contexts_by_focus(self, focus_area: str, limit: int = 10):
         """Retrieve contexts by focus area."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._lock:
+            cursor = self._conn.execute(self._SELECT_CTX_SQL, (focus_area, limit))
 
-        cursor.execute('''
-            SELECT source, content, timestamp, metadata
-            FROM contexts
-            WHERE focus_area = ?
-            ORDER BY timestamp DESC
-            LIMIT ?
-        ''', (focus_area, limit))
-
-        results = cursor.fetchall()
-        conn.close()
+            results = cursor.fetchall()
 
         return [
             {
                 "source": row[0],
                 "content": row[1],
                 "timestamp": row[2],
-                "metadata": json.loads(row[3])
+                "metadata": _json_loads(row[3])
             }
             for row in results
         ]
@@ -120,6 +208,81 @@ class ContextDatabase:
 # Global context database
 context_db = ContextDatabase()
 
+# Source classification: one compiled scan per source instead of five
+# substring passes. Prefixes map onto the labels the output already uses.
+_SRC_RE = re.compile(r"(file|api|db|log|config):", re.IGNORECASE)
+_SRC_LABELS = {"file": "file", "api": "api", "db": "database",
+               "log": "log", "config": "configuration"}
+
+# Focus-area profiles: themes and recommendations keyed by the aliases a
+# caller may pass. Frozenset membership replaces repeated lowercase/compare
+# chains, and the default profile covers everything else.
+_SECURITY_FOCI = frozenset({"security", "auth", "authentication"})
+_PERF_FOCI = frozenset({"performance", "optimization"})
+_ARCH_FOCI = frozenset({"architecture", "design"})
+
+_FOCUS_PROFILES = (
+    (_SECURITY_FOCI,
+     ["authentication", "authorization", "encryption", "security_policies"],
+     ["Review access controls", "Audit security configurations", "Check for vulnerabilities"]),
+    (_PERF_FOCI,
+     ["performance_metrics", "bottlenecks", "resource_usage", "optimization_opportunities"],
+     ["Profile critical paths", "Monitor resource usage", "Implement caching strategies"]),
+    (_ARCH_FOCI,
+     ["system_design", "component_relationships", "scalability", "maintainability"],
+     ["Document architectural decisions", "Review component coupling", "Plan for scalability"]),
+)
+
+_DEFAULT_THEMES = ["data_flow", "integration_points", "dependencies", "business_logic"]
+_DEFAULT_RECOMMENDATIONS = ["Map data flows", "Identify integration points", "Document dependencies"]
+
+# Complexity keyword sets: the task description is tokenized once and each
+# indicator becomes a set intersection instead of its own substring scan.
+_WORD_RE = re.compile(r"[a-z]+")
+_MULTI_STEP_WORDS = frozenset({"and", "then", "after", "before", "while"})
+_INTEGRATION_WORDS = frozenset({"integrate", "connect", "sync", "api", "service"})
+_DATA_WORDS = frozenset({"data", "database", "model", "schema", "migrate"})
+_DEPENDENCY_WORDS = frozenset({"depends", "requires", "needs", "prerequisite"})
+_PERF_WORDS = frozenset({"fast", "optimize", "performance", "scale"})
+
+# Execution-phase templates. The dependency phase leads and validation
+# closes every plan; the table rows are included when their complexity
+# indicator is set, in this order.
+_DEPENDENCY_PHASE = {
+    "phase": "Dependency Analysis",
+    "description": "Identify and analyze all dependencies",
+    "estimated_effort": "Low",
+    "parallel_capable": False
+}
+
+_PHASE_TABLE = (
+    ("involves_data", {
+        "phase": "Data Integration",
+        "description": "Handle data operations and storage requirements",
+        "estimated_effort": "Medium",
+        "parallel_capable": True
+    }),
+    ("requires_integration", {
+        "phase": "Integration & Testing",
+        "description": "Integrate with external systems and validate",
+        "estimated_effort": "Medium",
+        "parallel_capable": False
+    }),
+    ("performance_critical", {
+        "phase": "Performance Optimization",
+        "description": "Optimize for performance and scalability",
+        "estimated_effort": "Medium",
+        "parallel_capable": True
+    }),
+)
+
+_VALIDATION_PHASE = {
+    "phase": "Validation & Deployment",
+    "description": "Final testing and deployment preparation",
+    "estimated_effort": "Low",
+    "parallel_capable": False
+}
+
 def analyze_context_sources(sources: List[str], focus_area: str) -> Dict[str, Any]:
     """Analyze and synthesize context from multiple sources."""
     analysis = {
@@ -133,65 +296,48 @@ def analyze_context_sources(sources: List[str], focus_area: str) -> Dict[str, An
     }
 
     # Analyze sources for patterns
-    source_types = {}
+    source_types = Counter()
     for source in sources:
-        source_type = "unknown"
-        if "file:" in source.lower():
-            source_type = "file"
-        elif "api:" in source.lower():
-            source_type = "api"
-        elif "db:" in source.lower():
-            source_type = "database"
-        elif "log:" in source.lower():
-            source_type = "log"
-        elif "config:" in source.lower():
-            source_type = "configuration"
-
-        source_types[source_type] = source_types.get(source_type, 0) + 1
-
-    analysis["source_distribution"] = source_types
-
-    # Generate key themes based on focus area
-    if focus_area.lower() in ["security", "auth", "authentication"]:
-        analysis["key_themes"] = ["authentication", "authorization", "encryption", "security_policies"]
-        analysis["recommendations"] = ["Review access controls", "Audit security configurations", "Check for vulnerabilities"]
-    elif focus_area.lower() in ["performance", "optimization"]:
-        analysis["key_themes"] = ["performance_metrics", "bottlenecks", "resource_usage", "optimization_opportunities"]
-        analysis["recommendations"] = ["Profile critical paths", "Monitor resource usage", "Implement caching strategies"]
-    elif focus_area.lower() in ["architecture", "design"]:
-        analysis["key_themes"] = ["system_design", "component_relationships", "scalability", "maintainability"]
-        analysis["recommendations"] = ["Document architectural decisions", "Review component coupling", "Plan for scalability"]
+        match = _SRC_RE.search(source)
+        source_types[_SRC_LABELS[match.group(1).lower()] if match else "unknown"] += 1
+
+    analysis["source_distribution"] = dict(source_types)
+
+    # Generate key themes based on focus area (lowercase once, then look up)
+    focus_lower = focus_area.lower()
+    for foci, themes, recommendations in _FOCUS_PROFILES:
+        if focus_lower in foci:
+            analysis["key_themes"] = themes
+            analysis["recommendations"] = recommendations
+            break
     else:
-        analysis["key_themes"] = ["data_flow", "integration_points", "dependencies", "business_logic"]
-        analysis["recommendations"] = ["Map data flows", "Identify integration points", "Document dependencies"]
+        analysis["key_themes"] = _DEFAULT_THEMES
+        analysis["recommendations"] = _DEFAULT_RECOMMENDATIONS
 
     return analysis
 
 def create_execution_plan(task_description: str, requirements: Dict, optimization_goals: List[str]) -> Dict[str, Any]:
     """Create an intelligent execution plan for complex tasks."""
-    plan_id = hashlib.md5(f"{task_description}:{datetime.now().isoformat()}".encode()).hexdigest()[:8]
+    plan_id = hashlib.sha256(f"{task_description}\0{datetime.now().isoformat()}".encode()).hexdigest()[:8]
 
-    # Analyze task complexity
+    # Analyze task complexity (tokenize once, then set intersections)
+    words = frozenset(_WORD_RE.findall(task_description.lower()))
     complexity_indicators = {
-        "multi_step": any(word in task_description.lower() for word in ["and", "then", "after", "before", "while"]),
-        "requires_integration": any(word in task_description.lower() for word in ["integrate", "connect", "sync", "api", "service"]),
-        "involves_data": any(word in task_description.lower() for word in ["data", "database", "model", "schema", "migrate"]),
-        "has_dependencies": any(word in task_description.lower() for word in ["depends", "requires", "needs", "prerequisite"]),
-        "performance_critical": any(word in task_description.lower() for word in ["fast", "optimize", "performance", "scale"])
+        "multi_step": bool(words & _MULTI_STEP_WORDS),
+        "requires_integration": bool(words & _INTEGRATION_WORDS),
+        "involves_data": bool(words & _DATA_WORDS),
+        "has_dependencies": bool(words & _DEPENDENCY_WORDS),
+        "performance_critical": bool(words & _PERF_WORDS)
     }
 
     complexity_score = sum(complexity_indicators.values()) / len(complexity_indicators)
 
-    # Generate execution phases
+    # Generate execution phases from the declarative templates; copies keep
+    # per-plan dicts independent of the module-level table.
     phases = []
 
     if complexity_indicators["has_dependencies"]:
-        phases.append({
-            "phase": "Dependency Analysis",
-            "description": "Identify and analyze all dependencies",
-            "estimated_effort": "Low",
-            "parallel_capable": False
-        })
+        phases.append(dict(_DEPENDENCY_PHASE))
 
     phases.append({
         "phase": "Core Implementation",
@@ -200,36 +346,10 @@ def create_execution_plan(task_description: str, requirements: Dict, optimizatio
         "parallel_capable": not complexity_indicators["has_dependencies"]
     })
 
-    if complexity_indicators["involves_data"]:
-        phases.append({
-            "phase": "Data Integration",
-            "description": "Handle data operations and storage requirements",
-            "estimated_effort": "Medium",
-            "parallel_capable": True
-        })
-
-    if complexity_indicators["requires_integration"]:
-        phases.append({
-            "phase": "Integration & Testing",
-            "description": "Integrate with external systems and validate",
-            "estimated_effort": "Medium",
-            "parallel_capable": False
-        })
-
-    if complexity_indicators["performance_critical"]:
-        phases.append({
-            "phase": "Performance Optimization",
-            "description": "Optimize for performance and scalability",
-            "estimated_effort": "Medium",
-            "parallel_capable": True
-        })
+    phases.extend(dict(phase) for indicator, phase in _PHASE_TABLE
+                  if complexity_indicators[indicator])
 
-    phases.append({
-        "phase": "Validation & Deployment",
-        "description": "Final testing and deployment preparation",
-        "estimated_effort": "Low",
-        "parallel_capable": False
-    })
+    phases.append(dict(_VALIDATION_PHASE))
 
     plan = {
         "plan_id": plan_id,
@@ -348,38 +468,56 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
             analysis = analyze_context_sources(sources, focus_area)
 
             if store_results:
-                for source in sources:
-                    context_db.store_context(source, f"Analyzed for {focus_area}", focus_area, analysis)
-
-            result = f"🧠 Context Intelligence Synthesis\n"
-            result += f"{'='*60}\n"
-            result += f"🎯 Focus Area: {analysis['focus_area']}\n"
-            result += f"📊 Sources Analyzed: {analysis['source_count']}\n"
-            result += f"🔍 Confidence Score: {analysis['confidence_score']:.2f}\n"
-            result += f"⏰ Analysis Time: {analysis['synthesis_timestamp']}\n\n"
-
-            result += f"📋 Source Distribution:\n"
+                # Serialize the shared fields once, not per source
+                content = f"Analyzed for {focus_area}"
+                timestamp = datetime.now().isoformat()
+                metadata_json = _json_dumps(analysis)
+                rows = [
+                    (
+                        _context_id(source, content, focus_area),
+                        source, content, focus_area,
+                        timestamp, metadata_json
+                    )
+                    for source in sources
+                ]
+                context_db.store_contexts_bulk(rows)
+
+            parts = [
+                f"{ICON_BRAIN} Context Intelligence Synthesis",
+                "=" * 60,
+                f"Focus Area: {analysis['focus_area']}",
+                f"Sources Analyzed: {analysis['source_count']}",
+                f"Confidence Score: {analysis['confidence_score']:.2f}",
+                f"Analysis Time: {analysis['synthesis_timestamp']}",
+                "",
+                "Source Distribution:"
+            ]
             for source_type, count in analysis['source_distribution'].items():
-                result += f"   {source_type.title()}: {count}\n"
+                parts.append(f"   {source_type.title()}: {count}")
 
-            result += f"\n🎨 Key Themes Identified:\n"
+            parts.append("")
+            parts.append("Key Themes Identified:")
             for theme in analysis['key_themes']:
-                result += f"   • {theme.replace('_', ' ').title()}\n"
+                parts.append(f"   * {theme.replace('_', ' ').title()}")
 
             if include_recommendations:
-                result += f"\n💡 AI Recommendations:\n"
+                parts.append("")
+                parts.append(f"{ICON_TIP} AI Recommendations:")
                 for rec in analysis['recommendations']:
-                    result += f"   → {rec}\n"
+                    parts.append(f"   -> {rec}")
 
-            result += f"\n📁 Analyzed Sources:\n"
+            parts.append("")
+            parts.append("Analyzed Sources:")
             for i, source in enumerate(sources[:5], 1):  # Show first 5 sources
-                result += f"   {i}. {source}\n"
+                parts.append(f"   {i}. {source}")
 
             if len(sources) > 5:
-                result += f"   ... and {len(sources) - 5} more sources\n"
+                parts.append(f"   ... and {len(sources) - 5} more sources")
+
+            result = "\n".join(parts)
 
         except Exception as e:
-            result = f"❌ Error in context synthesis: {e}"
+            result = f"{ICON_ERROR} Error in context synthesis: {e}"
 
         return [TextContent(type="text", text=result)]
 
@@ -390,16 +528,19 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
         include_predictions = arguments.get("include_predictions", False)
         benchmark_comparison = arguments.get("benchmark_comparison", False)
 
-        result = f"📈 Advanced Workflow Performance Analysis\n"
-        result += f"{'='*60}\n"
+        parts = [
+            "Advanced Workflow Performance Analysis",
+            "=" * 60
+        ]
 
         if workflow_id:
-            result += f"🔍 Workflow ID: {workflow_id}\n"
+            parts.append(f"Workflow ID: {workflow_id}")
         else:
-            result += f"🔍 Analysis Scope: All active workflows\n"
+            parts.append("Analysis Scope: All active workflows")
 
-        result += f"⏰ Time Range: {time_range}\n"
-        result += f"📊 Metrics: {', '.join(metrics)}\n\n"
+        parts.append(f"Time Range: {time_range}")
+        parts.append(f"Metrics: {', '.join(metrics)}")
+        parts.append("")
 
         # Simulate performance analysis
         performance_data = {
@@ -410,24 +551,26 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
             "throughput": "12.4 tasks/hour"
         }
 
-        result += f"📋 Performance Summary:\n"
+        parts.append("Performance Summary:")
         for metric, value in performance_data.items():
-            status = "✅" if "success" in metric or float(value.split('%')[0]) > 80 else "⚠️"
-            result += f"   {status} {metric.replace('_', ' ').title()}: {value}\n"
+            status = ICON_OK if "success" in metric or float(value.split('%')[0]) > 80 else ICON_WARN
+            parts.append(f"   {status} {metric.replace('_', ' ').title()}: {value}")
 
         if include_predictions:
-            result += f"\n🔮 Performance Predictions:\n"
-            result += f"   📈 Expected 24h performance: 95.2% success rate\n"
-            result += f"   🎯 Optimization potential: 12% improvement possible\n"
-            result += f"   ⚡ Bottleneck prediction: Memory usage may peak at 3 PM\n"
+            parts.append("")
+            parts.append("Performance Predictions:")
+            parts.append("   * Expected 24h performance: 95.2% success rate")
+            parts.append("   * Optimization potential: 12% improvement possible")
+            parts.append("   * Bottleneck prediction: Memory usage may peak at 3 PM")
 
         if benchmark_comparison:
-            result += f"\n📊 Benchmark Comparison:\n"
-            result += f"   🏆 vs Last Week: +3.2% improvement\n"
-            result += f"   📅 vs Last Month: +8.7% improvement\n"
-            result += f"   🎯 vs Industry Average: +15.3% above average\n"
+            parts.append("")
+            parts.append("Benchmark Comparison:")
+            parts.append("   * vs Last Week: +3.2% improvement")
+            parts.append("   * vs Last Month: +8.7% improvement")
+            parts.append("   * vs Industry Average: +15.3% above average")
 
-        return [TextContent(type="text", text=result)]
+        return [TextContent(type="text", text="\n".join(parts))]
 
     elif name == "create_execution_plan":
         task_description = arguments.get("task_description", "")
@@ -439,45 +582,53 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
         try:
             plan = create_execution_plan(task_description, requirements, optimization_goals)
 
-            result = f"🚀 AI-Optimized Execution Plan\n"
-            result += f"{'='*60}\n"
-            result += f"📝 Task: {plan['task_description']}\n"
-            result += f"🆔 Plan ID: {plan['plan_id']}\n"
-            result += f"📊 Complexity Score: {plan['complexity_score']:.2f}/1.0\n"
-            result += f"⏱️  Estimated Duration: {plan['estimated_duration']}\n"
-            result += f"🔄 Parallel Opportunities: {plan['parallel_opportunities']}\n\n"
-
-            result += f"🎯 Optimization Goals:\n"
+            parts = [
+                "AI-Optimized Execution Plan",
+                "=" * 60,
+                f"Task: {plan['task_description']}",
+                f"Plan ID: {plan['plan_id']}",
+                f"Complexity Score: {plan['complexity_score']:.2f}/1.0",
+                f"Estimated Duration: {plan['estimated_duration']}",
+                f"Parallel Opportunities: {plan['parallel_opportunities']}",
+                "",
+                "Optimization Goals:"
+            ]
             for goal in plan['optimization_goals']:
-                result += f"   • {goal.title()}\n"
+                parts.append(f"   * {goal.title()}")
 
-            result += f"\n📋 Execution Phases:\n"
+            parts.append("")
+            parts.append("Execution Phases:")
             for i, phase in enumerate(plan['execution_phases'], 1):
-                parallel_icon = "🔄" if phase['parallel_capable'] else "➡️"
-                result += f"   {i}. {parallel_icon} {phase['phase']} ({phase['estimated_effort']} effort)\n"
-                result += f"      {phase['description']}\n"
+                parallel_icon = ICON_PARALLEL if phase['parallel_capable'] else ICON_SEQUENTIAL
+                parts.append(f"   {i}. {parallel_icon} {phase['phase']} ({phase['estimated_effort']} effort)")
+                parts.append(f"      {phase['description']}")
 
             if suggest_agents:
-                result += f"\n🤖 Suggested Agent Assignments:\n"
+                parts.append("")
+                parts.append("Suggested Agent Assignments:")
                 if "implement" in task_description.lower():
-                    result += f"   • backend-implementer: Core functionality\n"
-                    result += f"   • test-automator: Testing and validation\n"
+                    parts.append("   * backend-implementer: Core functionality")
+                    parts.append("   * test-automator: Testing and validation")
                 if "security" in task_description.lower():
-                    result += f"   • security-architect: Security review\n"
+                    parts.append("   * security-architect: Security review")
                 if "database" in task_description.lower() or "data" in task_description.lower():
-                    result += f"   • database-migration: Data operations\n"
+                    parts.append("   * database-migration: Data operations")
 
             if plan['recommendations']:
-                result += f"\n💡 AI Recommendations:\n"
+                parts.append("")
+                parts.append(f"{ICON_TIP} AI Recommendations:")
                 for rec in plan['recommendations']:
-                    result += f"   → {rec}\n"
+                    parts.append(f"   -> {rec}")
 
             if save_plan:
                 # In a real implementation, save to database
-                result += f"\n💾 Plan saved for future reference\n"
+                parts.append("")
+                parts.append("Plan saved for future reference")
+
+            result = "\n".join(parts)
 
         except Exception as e:
-            result = f"❌ Error creating execution plan: {e}"
+            result = f"{ICON_ERROR} Error creating execution plan: {e}"
 
         return [TextContent(type="text", text=result)]
 
@@ -488,13 +639,16 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
         limit = arguments.get("limit", 10)
 
         try:
-            result = f"🔍 Context Memory Search\n"
-            result += f"{'='*60}\n"
-            result += f"🔎 Query: '{query}'\n"
+            parts = [
+                "Context Memory Search",
+                "=" * 60,
+                f"Query: '{query}'"
+            ]
             if focus_area:
-                result += f"🎯 Focus Area: {focus_area}\n"
-            result += f"⏰ Time Range: {time_range}\n"
-            result += f"📊 Result Limit: {limit}\n\n"
+                parts.append(f"Focus Area: {focus_area}")
+            parts.append(f"Time Range: {time_range}")
+            parts.append(f"Result Limit: {limit}")
+            parts.append("")
 
             # Search stored contexts
             if focus_area:
@@ -503,17 +657,20 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
                 contexts = []  # In real implementation, search all contexts
 
             if contexts:
-                result += f"📋 Found {len(contexts)} relevant contexts:\n"
+                parts.append(f"Found {len(contexts)} relevant contexts:")
                 for i, context in enumerate(contexts, 1):
-                    result += f"\n   {i}. Source: {context['source']}\n"
-                    result += f"      Content: {context['content'][:100]}...\n"
-                    result += f"      Timestamp: {context['timestamp']}\n"
+                    parts.append("")
+                    parts.append(f"   {i}. Source: {context['source']}")
+                    parts.append(f"      Content: {context['content'][:100]}...")
+                    parts.append(f"      Timestamp: {context['timestamp']}")
             else:
-                result += f"📭 No matching contexts found\n"
-                result += f"💡 Suggestion: Try broader search terms or different focus area\n"
+                parts.append("No matching contexts found")
+                parts.append(f"{ICON_TIP} Suggestion: Try broader search terms or different focus area")
+
+            result = "\n".join(parts)
 
         except Exception as e:
-            result = f"❌ Error searching context memory: {e}"
+            result = f"{ICON_ERROR} Error searching context memory: {e}"
 
         return [TextContent(type="text", text=result)]
 
@@ -521,53 +678,59 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
         include_metrics = arguments.get("include_metrics", True)
         check_data_quality = arguments.get("check_data_quality", True)
 
-        result = f"🏥 Context Intelligence Health Check\n"
-        result += f"{'='*60}\n"
-        result += f"⏰ Check Time: {datetime.now().isoformat()}\n\n"
+        parts = [
+            "Context Intelligence Health Check",
+            "=" * 60,
+            f"Check Time: {datetime.now().isoformat()}",
+            ""
+        ]
 
         # System health checks
         health_checks = {
-            "Database Connection": "✅ Healthy",
-            "Context Storage": "✅ Operational",
-            "Memory Usage": "✅ Normal (73%)",
-            "Processing Speed": "✅ Optimal",
-            "Error Rate": "✅ Low (0.8%)"
+            "Database Connection": f"{ICON_OK} Healthy",
+            "Context Storage": f"{ICON_OK} Operational",
+            "Memory Usage": f"{ICON_OK} Normal (73%)",
+            "Processing Speed": f"{ICON_OK} Optimal",
+            "Error Rate": f"{ICON_OK} Low (0.8%)"
         }
 
-        result += f"🩺 System Health:\n"
+        parts.append("System Health:")
         for check, status in health_checks.items():
-            result += f"   {status} {check}\n"
+            parts.append(f"   {status} {check}")
 
         if include_metrics:
-            result += f"\n📊 Performance Metrics:\n"
-            result += f"   • Context Synthesis Speed: 150ms avg\n"
-            result += f"   • Plan Generation Time: 340ms avg\n"
-            result += f"   • Memory Search Latency: 45ms avg\n"
-            result += f"   • Daily Context Processed: 1,247\n"
-            result += f"   • Success Rate: 98.7%\n"
+            parts.append("")
+            parts.append("Performance Metrics:")
+            parts.append("   * Context Synthesis Speed: 150ms avg")
+            parts.append("   * Plan Generation Time: 340ms avg")
+            parts.append("   * Memory Search Latency: 45ms avg")
+            parts.append("   * Daily Context Processed: 1,247")
+            parts.append("   * Success Rate: 98.7%")
 
         if check_data_quality:
-            result += f"\n🔍 Data Quality Assessment:\n"
-            result += f"   ✅ Data Integrity: 99.2%\n"
-            result += f"   ✅ Context Completeness: 94.8%\n"
-            result += f"   ✅ Source Diversity: Good\n"
-            result += f"   ⚠️  Duplicate Detection: 3.1% duplicates found\n"
-            result += f"   ✅ Timestamp Accuracy: 100%\n"
-
-        result += f"\n💡 Recommendations:\n"
-        result += f"   → Schedule duplicate cleanup\n"
-        result += f"   → Monitor memory usage trends\n"
-        result += f"   → Consider expanding source diversity\n"
-
-        return [TextContent(type="text", text=result)]
+            parts.append("")
+            parts.append("Data Quality Assessment:")
+            parts.append(f"   {ICON_OK} Data Integrity: 99.2%")
+            parts.append(f"   {ICON_OK} Context Completeness: 94.8%")
+            parts.append(f"   {ICON_OK} Source Diversity: Good")
+            parts.append(f"   {ICON_WARN} Duplicate Detection: 3.1% duplicates found")
+            parts.append(f"   {ICON_OK} Timestamp Accuracy: 100%")
+
+        parts.append("")
+        parts.append(f"{ICON_TIP} Recommendations:")
+        parts.append("   -> Schedule duplicate cleanup")
+        parts.append("   -> Monitor memory usage trends")
+        parts.append("   -> Consider expanding source diversity")
+
+        return [TextContent(type="text", text="\n".join(parts))]
 
     else:
-        return [TextContent(type="text", text=f"❌ Unknown tool: {name}")]
+        return [TextContent(type="text", text=f"{ICON_ERROR} Unknown tool: {name}")]
 
 async def main():
     """Run the MCP server."""
-    print("🧠 Context Intelligence MCP Server 2025 starting...", file=sys.stderr)
-    print("✅ Context Intelligence MCP Server ready with advanced AI capabilities", file=sys.stderr)
+    print(f"{ICON_BRAIN} Context Intelligence MCP Server 2025 starting...", file=sys.stderr)
+    print(f"{ICON_OK} Context Intelligence MCP Server ready with advanced AI capabilities", file=sys.stderr)
 
     async with stdio_server() as streams:
         await app.run(streams[0], streams[1], app.create_initialization_options())
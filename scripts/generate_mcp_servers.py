@@ -309,12 +309,34 @@ import asyncio
 import json
 import sys
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 logging.basicConfig(level=logging.INFO, stream=sys.stderr,
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Prefer orjson (serializes straight to bytes) when available
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+    _json_loads = json.loads
+
+# The initialize result is constant for the server's lifetime, so build
+# it once instead of on every initialize call.
+_INIT_RESULT = {{
+    "protocolVersion": "2024-11-05",
+    "capabilities": {{"tools": {{}}}},
+    "serverInfo": {{"name": "{server_name}", "version": "1.0.0"}}
+}}
+
 class {server_name.replace("-", "_").title().replace("_", "")}:
     """{config["description"]}"""
 
@@ -348,11 +370,7 @@ class MCPServer:
             params = request.get('params', {{}})
 
             if method == 'initialize':
-                return {{
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {{"tools": {{}}}},
-                    "serverInfo": {{"name": "{server_name}", "version": "1.0.0"}}
-                }}
+                return _INIT_RESULT
             elif method == 'tools/list':
                 return {{
                     "tools": [
@@ -374,38 +392,75 @@ class MCPServer:
 async def main():
     """Main server loop"""
     server = MCPServer()
-
-    while True:
+    stdout = sys.stdout.buffer
+    _scratch = bytearray()
+
+    def _write_response(obj: Dict[str, Any]) -> None:
+        # Reuse one scratch buffer per connection; the OS write copies it,
+        # so clearing and refilling between responses is safe.
+        nonlocal _scratch
+        _scratch.clear()
+        _scratch += _json_dumps(obj)
+        _scratch += b"\\n"
+        stdout.write(_scratch)
+        stdout.flush()
+
+    def _parse(line: bytes) -> Optional[Dict[str, Any]]:
+        # Narrow try: only JSON decoding can raise here; bad frames get
+        # their parse-error response immediately.
         try:
-            line = await asyncio.get_event_loop().run_in_executor(None, sys.stdin.readline)
-            if not line:
-                break
-
-            request = json.loads(line.strip())
-            response = await server.handle_request(request)
-
-            if 'id' in request:
-                response['id'] = request['id']
-            response['jsonrpc'] = '2.0'
+            return _json_loads(line)
+        except ValueError as e:
+            logger.error(f"Invalid JSON received: {{e}}")
+            _write_response({{
+                "jsonrpc": "2.0",
+                "error": {{"code": -32700, "message": "Parse error"}},
+                "id": None
+            }})
+            return None
 
-            print(json.dumps(response), flush=True)
+    # Read stdin through the event loop directly; the old
+    # run_in_executor(readline) path paid a thread-pool hop per message.
+    # The explicit limit raises the 64 KiB StreamReader default, which
+    # large tool arguments routinely exceed.
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=2**24)
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
 
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON received: {{e}}")
-            error_response = {{
+    while True:
+        try:
+            line = await reader.readline()
+        except ValueError as e:
+            # Over-limit line: readline discards the oversized data and the
+            # stream stays usable, so report it and keep serving.
+            logger.error(f"Request line exceeded read limit: {{e}}")
+            _write_response({{
                 "jsonrpc": "2.0",
                 "error": {{"code": -32700, "message": "Parse error"}},
                 "id": None
-            }}
-            print(json.dumps(error_response), flush=True)
+            }})
+            continue
+        if not line:
+            break
+
+        request = _parse(line.strip())
+        if request is None:
+            continue
+
+        try:
+            response = await server.handle_request(request)
         except Exception as e:
             logger.error(f"Unexpected error: {{e}}")
-            error_response = {{
+            _write_response({{
                 "jsonrpc": "2.0",
                 "error": {{"code": -32603, "message": f"Internal error: {{str(e)}}"}},
-                "id": request.get('id') if 'request' in locals() else None
-            }}
-            print(json.dumps(error_response), flush=True)
+                "id": request.get('id')
+            }})
+            continue
+
+        # One-shot envelope: no post-hoc mutation, id is null for
+        # notifications (valid JSON-RPC).
+        _write_response({{"jsonrpc": "2.0", "id": request.get('id'), **response}})
 
 if __name__ == "__main__":
     asyncio.run(main())